@@ -288,7 +288,13 @@ class DataPoint:
         else:
             return torch.tensor([], device=flair.device)
 
-    def get_each_embedding(self, embedding_names: Optional[List[str]] = None) -> List[torch.Tensor]:
+    def get_each_embedding(
+        self, embedding_names: Optional[List[str]] = None, names_are_sorted: bool = False
+    ) -> List[torch.Tensor]:
+        # if the caller already sorted (and de-duplicated) the names, only look these up instead of scanning all keys
+        if names_are_sorted and embedding_names:
+            return [self._embeddings[name].to(flair.device) for name in embedding_names if name in self._embeddings]
+
         embeddings = []
         for embed_name in sorted(self._embeddings.keys()):
             if embedding_names and embed_name not in embedding_names:
@@ -1769,35 +1775,28 @@ def get_spans_from_bio(bioes_tags: List[str], bioes_scores=None) -> List[typing.
     # return complex list
     found_spans = []
     # internal variables
-    current_tag_weights: Dict[str, float] = defaultdict(lambda: 0.0)
-    previous_tag = "O-"
+    current_tag_weights: Dict[str, float] = {}
+    previous_tag_value = ""
     current_span: List[int] = []
     current_span_scores: List[float] = []
+    has_scores = bool(bioes_scores)
     for idx, bioes_tag in enumerate(bioes_tags):
         # non-set tags are OUT tags
         if bioes_tag == "" or bioes_tag == "O" or bioes_tag == "_":
             bioes_tag = "O-"
 
         # anything that is not OUT is IN
-        in_span = False if bioes_tag == "O-" else True
-
-        # does this prediction start a new span?
-        starts_new_span = False
-
-        # begin and single tags start new spans
-        if bioes_tag[0:2] in ["B-", "S-"]:
-            starts_new_span = True
+        in_span = bioes_tag != "O-"
 
-        # in IOB format, an I tag starts a span if it follows an O or is a different span
-        if bioes_tag[0:2] == "I-" and previous_tag[2:] != bioes_tag[2:]:
-            starts_new_span = True
+        prefix = bioes_tag[0:2]
+        tag_value = bioes_tag[2:]
 
-        # single tags that change prediction start new spans
-        if bioes_tag[0:2] in ["S-"] and previous_tag[2:] != bioes_tag[2:]:
-            starts_new_span = True
+        # begin and single tags start new spans, in IOB format an I tag starts a span if it follows an O
+        # or is a different span
+        starts_new_span = prefix == "B-" or prefix == "S-" or (prefix == "I-" and previous_tag_value != tag_value)
 
         # if an existing span is ended (either by reaching O or starting a new span)
-        if (starts_new_span or not in_span) and len(current_span) > 0:
+        if (starts_new_span or not in_span) and current_span:
             # determine score and value
             span_score = sum(current_span_scores) / len(current_span_scores)
             span_value = max(current_tag_weights.keys(), key=current_tag_weights.__getitem__)
@@ -1808,15 +1807,15 @@ def get_spans_from_bio(bioes_tags: List[str], bioes_scores=None) -> List[typing.
             # reset for-loop variables for new span
             current_span = []
             current_span_scores = []
-            current_tag_weights = defaultdict(lambda: 0.0)
+            current_tag_weights = {}
 
         if in_span:
             current_span.append(idx)
-            current_span_scores.append(bioes_scores[idx] if bioes_scores else 1.0)
+            current_span_scores.append(bioes_scores[idx] if has_scores else 1.0)
             weight = 1.1 if starts_new_span else 1.0
-            current_tag_weights[bioes_tag[2:]] += weight
+            current_tag_weights[tag_value] = current_tag_weights.get(tag_value, 0.0) + weight
 
         # remember previous tag
-        previous_tag = bioes_tag
+        previous_tag_value = tag_value
 
     return found_spans
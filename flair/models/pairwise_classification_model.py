@@ -79,15 +79,27 @@ class TextPairClassifier(flair.nn.DefaultClassifier[TextPair, TextPair]):
                 0,
             )
         else:
-            concatenated_sentence = Sentence(
-                prediction_data_point.first.to_tokenized_string()
-                + self.sep
-                + prediction_data_point.second.to_tokenized_string(),
-                use_tokenizer=False,
-            )
+            concatenated_sentence = self._get_concatenated_sentence(prediction_data_point)
             self.embeddings.embed(concatenated_sentence)
             return concatenated_sentence.get_embedding(embedding_names)
 
+    def _get_embeddings_for_data_points(self, data_points: List[TextPair]) -> torch.Tensor:
+        # embed the texts of all pairs in one batched forward pass, instead of one forward pass per pair
+        if self.embed_separately:
+            self.embeddings.embed([sentence for pair in data_points for sentence in (pair.first, pair.second)])
+            return super()._get_embeddings_for_data_points(data_points)
+
+        embedding_names = self.embeddings.get_names()
+        concatenated_sentences = [self._get_concatenated_sentence(pair) for pair in data_points]
+        self.embeddings.embed(concatenated_sentences)
+        return torch.stack([sentence.get_embedding(embedding_names) for sentence in concatenated_sentences])
+
+    def _get_concatenated_sentence(self, data_point: TextPair) -> Sentence:
+        return Sentence(
+            data_point.first.to_tokenized_string() + self.sep + data_point.second.to_tokenized_string(),
+            use_tokenizer=False,
+        )
+
     def _get_state_dict(self):
         model_state = {
             **super()._get_state_dict(),
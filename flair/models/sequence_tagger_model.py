@@ -85,18 +85,13 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
                 # with UNK, the model learns less well if there are no UNK examples
                 self.label_dictionary = Dictionary(add_unk=allow_unk_predictions)
                 assert self.tag_format in ["BIOES", "BIO"]
-                for label in tag_dictionary.get_items():
-                    if label == "<unk>":
-                        continue
+                span_labels = [label for label in tag_dictionary.get_items() if label != "<unk>"]
+                if span_labels:
                     self.label_dictionary.add_item("O")
-                    if self.tag_format == "BIOES":
-                        self.label_dictionary.add_item("S-" + label)
-                        self.label_dictionary.add_item("B-" + label)
-                        self.label_dictionary.add_item("E-" + label)
-                        self.label_dictionary.add_item("I-" + label)
-                    if self.tag_format == "BIO":
-                        self.label_dictionary.add_item("B-" + label)
-                        self.label_dictionary.add_item("I-" + label)
+                prefixes = ["S-", "B-", "E-", "I-"] if self.tag_format == "BIOES" else ["B-", "I-"]
+                for label in span_labels:
+                    for prefix in prefixes:
+                        self.label_dictionary.add_item(prefix + label)
             else:
                 self.label_dictionary = tag_dictionary
 
@@ -129,6 +124,11 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
             self.label_dictionary.set_start_stop_tags()
             self.tagset_size += 2
 
+        # str-keyed view of the tag dictionary, so that gold labels need not be encoded to bytes for every token
+        self._tag_to_idx: Dict[str, int] = {
+            tag.decode("utf-8"): idx for tag, idx in self.label_dictionary.item2idx.items()
+        }
+
         # ----- Dropout parameters -----
         # dropouts
 
@@ -338,17 +338,16 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
         return self.loss_function(scores, labels), len(labels)
 
     def _make_padded_tensor_for_batch(self, sentences: List[Sentence]) -> Tuple[torch.LongTensor, torch.Tensor]:
-        names = self.embeddings.get_names()
+        # sort the embedding names once per batch, so the per-token work is reduced to plain lookups
+        names = sorted(set(self.embeddings.get_names()))
         lengths: List[int] = [len(sentence.tokens) for sentence in sentences]
         longest_token_sequence_in_batch: int = max(lengths)
-        pre_allocated_zero_tensor = torch.zeros(
-            self.embeddings.embedding_length * longest_token_sequence_in_batch,
-            dtype=torch.float,
-            device=flair.device,
+        pre_allocated_zero_tensor = self._get_padding_zeros(
+            self.embeddings.embedding_length * longest_token_sequence_in_batch
         )
         all_embs = list()
         for sentence in sentences:
-            all_embs += [emb for token in sentence for emb in token.get_each_embedding(names)]
+            all_embs += [emb for token in sentence for emb in token.get_each_embedding(names, names_are_sorted=True)]
             nb_padding_tokens = longest_token_sequence_in_batch - len(sentence)
 
             if nb_padding_tokens > 0:
@@ -364,6 +363,23 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
         )
         return torch.LongTensor(lengths), sentence_tensor
 
+    def _get_padding_zeros(self, size: int) -> torch.Tensor:
+        # the padding is only read from (torch.cat copies it), so the same buffer can be sliced for every batch.
+        # it is created lazily and not pickled (see __getstate__), so it may be missing on loaded models
+        zeros: Optional[torch.Tensor] = getattr(self, "_padding_zeros", None)
+        if zeros is None or zeros.size(0) < size or zeros.device != torch.device(flair.device):
+            zeros = torch.zeros(size, dtype=torch.float, device=flair.device)
+            self._padding_zeros = zeros
+        return zeros
+
+    def __getstate__(self):
+        # the padding buffer is a cache, do not pickle it along with the model (e.g. as part of a TARS model).
+        # older torch versions do not define Module.__getstate__, and object.__getstate__ returns __dict__ itself
+        parent_getstate = getattr(super(), "__getstate__", None)
+        state = dict(parent_getstate()) if parent_getstate is not None else self.__dict__.copy()
+        state.pop("_padding_zeros", None)
+        return state
+
     @staticmethod
     def _get_scores_from_features(features: torch.Tensor, lengths: torch.Tensor):
         """
@@ -379,47 +395,59 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
 
         return scores
 
-    def _get_gold_labels(self, sentences: List[Sentence]) -> List[str]:
+    def _get_tag_idx(self, tag: str) -> int:
+        idx = self._tag_to_idx.get(tag)
+        return idx if idx is not None else self.label_dictionary.get_idx_for_item(tag)
+
+    def _get_gold_labels(self, sentences: List[Sentence]) -> List[int]:
         """
-        Extracts gold labels from each sentence.
+        Extracts gold labels from each sentence as indices of the label dictionary.
         :param sentences: List of sentences in batch
         """
         # spans need to be encoded as token-level predictions
         if self.predict_spans:
-            all_sentence_labels = []
+            prefixes = ["B-", "I-", "E-", "S-"] if self.tag_format == "BIOES" else ["B-", "I-"]
+            outside_idx = self._get_tag_idx("O")
+            # indices of the prefixed tags for each span label, so no tag strings are built per token
+            tag_indices: Dict[str, List[int]] = {}
+            labels: List[int] = []
             for sentence in sentences:
-                sentence_labels = ["O"] * len(sentence)
+                sentence_labels = [outside_idx] * len(sentence)
                 for label in sentence.get_labels(self.label_type):
+                    if label.value not in tag_indices:
+                        tag_indices[label.value] = [self._get_tag_idx(prefix + label.value) for prefix in prefixes]
+                    indices = tag_indices[label.value]
                     span: Span = label.data_point
+                    start, end = span[0].idx - 1, span[-1].idx
                     if self.tag_format == "BIOES":
                         if len(span) == 1:
-                            sentence_labels[span[0].idx - 1] = "S-" + label.value
+                            sentence_labels[start] = indices[3]
                         else:
-                            sentence_labels[span[0].idx - 1] = "B-" + label.value
-                            sentence_labels[span[-1].idx - 1] = "E-" + label.value
-                            for i in range(span[0].idx, span[-1].idx - 1):
-                                sentence_labels[i] = "I-" + label.value
+                            sentence_labels[start] = indices[0]
+                            sentence_labels[start + 1 : end - 1] = [indices[1]] * (end - start - 2)
+                            sentence_labels[end - 1] = indices[2]
                     else:
-                        sentence_labels[span[0].idx - 1] = "B-" + label.value
-                        for i in range(span[0].idx, span[-1].idx):
-                            sentence_labels[i] = "I-" + label.value
-                all_sentence_labels.extend(sentence_labels)
-            labels = all_sentence_labels
+                        sentence_labels[start] = indices[0]
+                        sentence_labels[start + 1 : end] = [indices[1]] * (end - start - 1)
+                labels.extend(sentence_labels)
 
         # all others are regular labels for each token
         else:
-            labels = [token.get_label(self.label_type, "O").value for sentence in sentences for token in sentence]
+            labels = [
+                self._get_tag_idx(token.get_label(self.label_type, "O").value)
+                for sentence in sentences
+                for token in sentence
+            ]
 
         return labels
 
     def _prepare_label_tensor(self, sentences: List[Sentence]):
-        gold_labels = self._get_gold_labels(sentences)
-        labels = torch.tensor(
-            [self.label_dictionary.get_idx_for_item(label) for label in gold_labels],
-            dtype=torch.long,
-            device=flair.device,
-        )
-        return labels
+        labels = torch.tensor(self._get_gold_labels(sentences), dtype=torch.long)
+
+        # build the tensor on CPU and send it in a single (pinned, asynchronous if on GPU) copy
+        if str(flair.device) != "cpu":
+            labels = labels.pin_memory()
+        return labels.to(flair.device, non_blocking=True)
 
     def predict(
         self,
@@ -464,17 +492,25 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
             if len(reordered_sentences) == 0:
                 return sentences
 
-            dataloader = DataLoader(
-                dataset=FlairDatapointDataset(reordered_sentences),
-                batch_size=mini_batch_size,
-            )
-            # progress bar for verbosity
-            if verbose:
-                dataloader = tqdm(dataloader, desc="Batch inference")
+            # only go through a DataLoader if there is more than one batch (e.g. not for batches passed by evaluate())
+            if len(reordered_sentences) > mini_batch_size:
+                batches: Union[DataLoader, List[List[Sentence]]] = DataLoader(
+                    dataset=FlairDatapointDataset(reordered_sentences),
+                    batch_size=mini_batch_size,
+                )
+                # progress bar for verbosity
+                if verbose:
+                    progress_bar = tqdm(batches, desc="Batch inference")
+                    batches = progress_bar
+            else:
+                batches = [reordered_sentences]
+
+            # decide once whether predictions are decoded into spans or added as token labels
+            predict_spans = self.predict_spans and not force_token_predictions
 
             overall_loss = torch.zeros(1, device=flair.device)
             label_count = 0
-            for batch in dataloader:
+            for batch in batches:
                 # stop if all sentences are empty
                 if not batch:
                     continue
@@ -505,18 +541,19 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
                     )
 
                 # add predictions to Sentence
-                for sentence, sentence_predictions in zip(batch, predictions):
+                if predict_spans:
                     # BIOES-labels need to be converted to spans
-                    if self.predict_spans and not force_token_predictions:
-                        sentence_tags = [label[0] for label in sentence_predictions]
-                        sentence_scores = [label[1] for label in sentence_predictions]
+                    for sentence, sentence_predictions in zip(batch, predictions):
+                        # unzip (tag, score) pairs in one pass (sentences are never empty here)
+                        sentence_tags, sentence_scores = map(list, zip(*sentence_predictions))
                         predicted_spans = get_spans_from_bio(sentence_tags, sentence_scores)
                         for predicted_span in predicted_spans:
                             span: Span = sentence[predicted_span[0][0] : predicted_span[0][-1] + 1]
                             span.add_label(label_name, value=predicted_span[2], score=predicted_span[1])
 
+                else:
                     # token-labels can be added directly ("O" and legacy "_" predictions are skipped)
-                    else:
+                    for sentence, sentence_predictions in zip(batch, predictions):
                         for token, label in zip(sentence.tokens, sentence_predictions):
                             if label[0] in ["O", "_"]:
                                 continue
@@ -539,25 +576,28 @@ class SequenceTagger(flair.nn.Classifier[Sentence]):
         :param batch: list of sentence
         :param probabilities_for_all_classes: whether to return score for each tag in tag dictionary
         """
-        softmax_batch = F.softmax(features, dim=1).cpu()
-        scores_batch, prediction_batch = torch.max(softmax_batch, dim=1)
+        if probabilities_for_all_classes:
+            softmax_batch = F.softmax(features, dim=1).cpu()
+            scores_batch, prediction_batch = torch.max(softmax_batch, dim=1)
+        else:
+            # softmax is monotonic, so take the argmax on the raw features and only compute the probability of it
+            max_features, prediction_batch = torch.max(features, dim=1)
+            scores_batch = torch.exp(max_features - torch.logsumexp(features, dim=1))
+            scores_batch, prediction_batch = scores_batch.cpu(), prediction_batch.cpu()
         predictions = []
         all_tags = []
 
-        for sentence in batch:
-            scores = scores_batch[: len(sentence)]
-            predictions_for_sentence = prediction_batch[: len(sentence)]
+        # scores are concatenated without padding, so they can be split directly by sentence length
+        lengths = [len(sentence) for sentence in batch]
+        for scores, predictions_for_sentence in zip(scores_batch.split(lengths), prediction_batch.split(lengths)):
             predictions.append(
                 [
-                    (self.label_dictionary.get_item_for_index(prediction), score.item())
-                    for token, score, prediction in zip(sentence, scores, predictions_for_sentence)
+                    (self.label_dictionary.get_item_for_index(prediction), score)
+                    for score, prediction in zip(scores.tolist(), predictions_for_sentence.tolist())
                 ]
             )
-            scores_batch = scores_batch[len(sentence) :]
-            prediction_batch = prediction_batch[len(sentence) :]
 
         if probabilities_for_all_classes:
-            lengths = [len(sentence) for sentence in batch]
             all_tags = self._all_scores_for_token(batch, softmax_batch, lengths)
 
         return predictions, all_tags
@@ -1006,25 +1046,19 @@ for entity in sentence.get_spans('ner'):
                         prefix = "I-"
 
                 # now print labels in CoNLL format
-                for token in datapoint:
-                    eval_line = (
-                        f"{token.text} "
-                        f"{token.get_label('gold_bio').value} "
-                        f"{token.get_label('predicted_bio').value}\n"
-                    )
-                    lines.append(eval_line)
+                lines.extend(
+                    f"{token.text} {token.get_label('gold_bio').value} {token.get_label('predicted_bio').value}\n"
+                    for token in datapoint
+                )
                 lines.append("\n")
 
         else:
             for datapoint in batch:
                 # print labels in CoNLL format
-                for token in datapoint:
-                    eval_line = (
-                        f"{token.text} "
-                        f"{token.get_label(gold_label_type).value} "
-                        f"{token.get_label('predicted').value}\n"
-                    )
-                    lines.append(eval_line)
+                lines.extend(
+                    f"{token.text} {token.get_label(gold_label_type).value} {token.get_label('predicted').value}\n"
+                    for token in datapoint
+                )
                 lines.append("\n")
         return lines
 
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Dict, Tuple
 
 import numpy as np
 import torch
@@ -57,10 +57,12 @@ class ViterbiLoss(torch.nn.Module):
 
         scores_upto_t = torch.zeros(batch_size, self.tagset_size, device=flair.device)
 
-        for t in range(max(lengths)):
-            batch_size_t = sum(
-                [length > t for length in lengths]
-            )  # since batch is ordered, we can save computation time by reducing our effective batch_size
+        # since batch is ordered, we can save computation time by reducing our effective batch_size
+        longest = int(lengths.max())
+        batch_sizes = (torch.arange(longest, device=lengths.device) < lengths.unsqueeze(1)).sum(dim=0).tolist()
+
+        for t in range(longest):
+            batch_size_t = batch_sizes[t]
 
             if t == 0:
                 # Initially, get scores from <start> tag to all other tags
@@ -89,9 +91,7 @@ class ViterbiLoss(torch.nn.Module):
         :param dim: dimension to calculate log-sum-exp of
         :return: log-sum-exp
         """
-        m, _ = torch.max(tensor, dim)
-        m_expanded = m.unsqueeze(dim).expand_as(tensor)
-        return m + torch.log(torch.sum(torch.exp(tensor - m_expanded), dim))
+        return torch.logsumexp(tensor, dim)
 
     def _format_targets(self, targets: torch.Tensor, lengths: torch.IntTensor):
         """
@@ -166,9 +166,15 @@ class ViterbiDecoder:
             * self.stop_tag
         )
 
+        # effective batch size (sans pads) and the sentences that end at each timestep, derived once from the lengths
+        batch_sizes = (torch.arange(seq_len, device=lengths.device) < lengths.unsqueeze(1)).sum(dim=0).tolist()
+        terminates_at: Dict[int, List[int]] = {}
+        for i, length in enumerate(lengths.tolist()):
+            terminates_at.setdefault(length - 1, []).append(i)
+
         for t in range(seq_len):
-            batch_size_t = sum([length > t for length in lengths])  # effective batch size (sans pads) at this timestep
-            terminates = [i for i, length in enumerate(lengths) if length == t + 1]
+            batch_size_t = batch_sizes[t]
+            terminates = terminates_at.get(t, [])
 
             if t == 0:
                 scores_upto_t[:batch_size_t, t] = features[:batch_size_t, t, :, self.start_tag]
@@ -209,12 +215,16 @@ class ViterbiDecoder:
         scores = softmax(scores_upto_t, dim=2)
         confidences = torch.max(scores, dim=2)
 
+        # move decoded tags and confidences to the host once, instead of one synchronizing .item() per token
+        decoded_list = decoded.cpu().tolist()
+        confidences_list = confidences.values.cpu().tolist()
+
         tags = []
-        for tag_seq, tag_seq_conf, length_seq in zip(decoded, confidences.values, lengths):
+        for tag_seq, tag_seq_conf, length_seq in zip(decoded_list, confidences_list, lengths.tolist()):
             tags.append(
                 [
-                    (self.tag_dictionary.get_item_for_index(tag), conf.item())
-                    for tag, conf in list(zip(tag_seq, tag_seq_conf))[:length_seq]
+                    (self.tag_dictionary.get_item_for_index(tag), conf)
+                    for tag, conf in zip(tag_seq[:length_seq], tag_seq_conf[:length_seq])
                 ]
             )
 
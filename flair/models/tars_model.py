@@ -32,6 +32,7 @@ class FewshotClassifier(flair.nn.Classifier[Sentence], ABC):
         self._current_task = None
         self._task_specific_attributes = {}
         self.label_nearest_map = None
+        self._label_sentences: Optional[Tuple[List[str], List[Sentence]]] = None
         self.tars_model: flair.nn.Classifier[Sentence]
         self.separator: str
 
@@ -87,6 +88,10 @@ class FewshotClassifier(flair.nn.Classifier[Sentence], ABC):
             sample = random.sample(tags, k=self.num_negative_labels_to_sample)
             return sample
 
+        # the map is only kept up to date by train(), so (re)build it if it is missing or belongs to another task
+        if self.label_nearest_map is None or any(label not in self.label_nearest_map for label in labels):
+            self._compute_label_similarity_for_current_epoch()
+
         already_sampled_negative_labels = set()
 
         # otherwise, go through all labels
@@ -123,10 +128,12 @@ class FewshotClassifier(flair.nn.Classifier[Sentence], ABC):
         If the `num_negative_labels_to_sample` is set to an integer value then before starting
         each epoch the model would create a similarity measure between the label names based
         on cosine distances between their BERT encoded embeddings.
+        The map is only recomputed when switching from evaluation into training mode
+        (or if no map exists yet), since the label embeddings do not change otherwise.
         """
         if mode and self.num_negative_labels_to_sample is not None:
-            self._compute_label_similarity_for_current_epoch()
-            super().train(mode)
+            if not self.training or self.label_nearest_map is None:
+                self._compute_label_similarity_for_current_epoch()
 
         super().train(mode)
 
@@ -137,11 +144,18 @@ class FewshotClassifier(flair.nn.Classifier[Sentence], ABC):
 
         # get and embed all labels by making a Sentence object that contains only the label text
         all_labels = [label.decode("utf-8") for label in self.get_current_label_dictionary().idx2item]
-        label_sentences = [Sentence(label) for label in all_labels]
 
-        self.tars_embeddings.eval()  # TODO: check if this is necessary
-        self.tars_embeddings.embed(label_sentences)
-        self.tars_embeddings.train()
+        # the label sentences are only re-created (and re-tokenized) if the labels changed, e.g. after switching tasks
+        if self._label_sentences is None or self._label_sentences[0] != all_labels:
+            self._label_sentences = (all_labels, [Sentence(label) for label in all_labels])
+        label_sentences = self._label_sentences[1]
+
+        # label embeddings are only used for sampling, so no gradients need to be tracked
+        was_training = self.tars_embeddings.training
+        self.tars_embeddings.eval()
+        with torch.no_grad():
+            self.tars_embeddings.embed(label_sentences)
+        self.tars_embeddings.train(was_training)
 
         # get each label embedding and scale between 0 and 1
         if isinstance(self.tars_embeddings, TokenEmbeddings):
@@ -149,6 +163,10 @@ class FewshotClassifier(flair.nn.Classifier[Sentence], ABC):
         else:
             encodings_np = [sentence.get_embedding().cpu().detach().numpy() for sentence in label_sentences]
 
+        # drop the embeddings, so the cached label sentences get re-embedded with the updated weights next time
+        for sentence in label_sentences:
+            sentence.clear_embeddings()
+
         normalized_encoding = minmax_scale(encodings_np)
 
         # compute similarity matrix
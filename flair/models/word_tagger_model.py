@@ -77,13 +77,12 @@ class WordTagger(flair.nn.DefaultClassifier[Sentence, Token]):
         lines = []
         for datapoint in batch:
             # now print labels in CoNLL format
-            for token in datapoint:
-                eval_line = (
-                    f"{token.text} "
-                    f"{token.get_label(gold_label_type, 'O').value} "
-                    f"{token.get_label('predicted', 'O').value}\n"
-                )
-                lines.append(eval_line)
+            lines.extend(
+                f"{token.text} "
+                f"{token.get_label(gold_label_type, 'O').value} "
+                f"{token.get_label('predicted', 'O').value}\n"
+                for token in datapoint
+            )
             lines.append("\n")
         return lines
 
@@ -19,7 +19,8 @@ def dot_product(a: torch.Tensor, b: torch.Tensor, normalize=False):
         a = torch.nn.functional.normalize(a, p=2, dim=1)
         b = torch.nn.functional.normalize(b, p=2, dim=1)
 
-    return torch.mm(a, b.transpose(0, 1))
+    # equivalent to a @ b.T
+    return torch.nn.functional.linear(a, b)
 
 
 class CosineDistance(torch.nn.Module):
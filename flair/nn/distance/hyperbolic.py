@@ -96,8 +96,8 @@ class HyperbolicDistance(nn.Module):
         mat_2_x_0 = torch.sqrt(1 + mat_2.pow(2).sum(dim=1, keepdim=True))
 
         # Compute bilinear form
-        left = mat_1_x_0.mm(mat_2_x_0.t())  # n_1 x n_2
-        right = mat_1[:, 1:].mm(mat_2[:, 1:].t())  # n_1 x n_2
+        left = torch.nn.functional.linear(mat_1_x_0, mat_2_x_0)  # n_1 x n_2
+        right = torch.nn.functional.linear(mat_1[:, 1:], mat_2[:, 1:])  # n_1 x n_2
 
         # Arcosh
         return arccosh(left - right).pow(2)
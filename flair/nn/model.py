@@ -648,6 +648,10 @@ class DefaultClassifier(Classifier[DT], typing.Generic[DT, DT2], ABC):
     def _get_embedding_for_data_point(self, prediction_data_point: DT2) -> torch.Tensor:
         raise NotImplementedError()
 
+    def _get_embeddings_for_data_points(self, data_points: List[DT2]) -> torch.Tensor:
+        """Returns the embeddings of all data points, stacked into a single tensor."""
+        return torch.stack([self._get_embedding_for_data_point(data_point) for data_point in data_points])
+
     @abstractmethod
     def _get_data_points_from_sentence(self, sentence: DT) -> List[DT2]:
         """Returns the data_points to which labels are added (Sentence, Span, Token, ... objects)"""
@@ -709,7 +713,7 @@ class DefaultClassifier(Classifier[DT], typing.Generic[DT, DT2], ABC):
             self.embeddings.embed(sentences)
 
         # get a tensor of data points
-        data_point_tensor = torch.stack([self._get_embedding_for_data_point(data_point) for data_point in data_points])
+        data_point_tensor = self._get_embeddings_for_data_points(data_points)
 
         # do dropout
         data_point_tensor = data_point_tensor.unsqueeze(1)
@@ -862,25 +866,25 @@ class DefaultClassifier(Classifier[DT], typing.Generic[DT, DT2], ABC):
                                 label_score = sigmoided[s_idx, l_idx].item()
                                 if label_score > label_threshold or return_probabilities_for_all_classes:
                                     data_point.add_label(typename=label_name, value=label_value, score=label_score)
-                    else:
+                    elif return_probabilities_for_all_classes:
                         softmax = torch.nn.functional.softmax(scores, dim=-1)
-
-                        if return_probabilities_for_all_classes:
-                            n_labels = softmax.size(1)
-                            for s_idx, data_point in enumerate(data_points):
-                                for l_idx in range(n_labels):
-                                    label_value = self.label_dictionary.get_item_for_index(l_idx)
-                                    if label_value == "O":
-                                        continue
-                                    label_score = softmax[s_idx, l_idx].item()
-                                    data_point.add_label(typename=label_name, value=label_value, score=label_score)
-                        else:
-                            conf, idx = torch.max(softmax, dim=-1)
-                            for data_point, c, i in zip(data_points, conf, idx):
-                                label_value = self.label_dictionary.get_item_for_index(i.item())
+                        n_labels = softmax.size(1)
+                        for s_idx, data_point in enumerate(data_points):
+                            for l_idx in range(n_labels):
+                                label_value = self.label_dictionary.get_item_for_index(l_idx)
                                 if label_value == "O":
                                     continue
-                                data_point.add_label(typename=label_name, value=label_value, score=c.item())
+                                label_score = softmax[s_idx, l_idx].item()
+                                data_point.add_label(typename=label_name, value=label_value, score=label_score)
+                    else:
+                        # softmax is monotonic, so only the probability of the best scoring label is computed
+                        max_scores, idx = torch.max(scores, dim=-1)
+                        conf = torch.exp(max_scores - torch.logsumexp(scores, dim=-1))
+                        for data_point, c, i in zip(data_points, conf, idx):
+                            label_value = self.label_dictionary.get_item_for_index(i.item())
+                            if label_value == "O":
+                                continue
+                            data_point.add_label(typename=label_name, value=label_value, score=c.item())
 
                 store_embeddings(batch, storage_mode=embedding_storage_mode)
 
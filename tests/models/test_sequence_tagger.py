@@ -1,7 +1,10 @@
+import pickle
+
 import pytest
 
 import flair
-from flair.embeddings import FlairEmbeddings, WordEmbeddings
+from flair.data import Dictionary, Sentence
+from flair.embeddings import FlairEmbeddings, OneHotEmbeddings, WordEmbeddings
 from flair.models import SequenceTagger
 from flair.trainers import ModelTrainer
 from tests.model_test_utils import BaseModelTest
@@ -124,3 +127,83 @@ class TestSequenceTagger(BaseModelTest):
         loaded_model.predict([example_sentence, self.empty_sentence])
         loaded_model.predict([self.empty_sentence])
         del loaded_model
+
+    @pytest.mark.parametrize("tag_format", ["BIO", "BIOES"])
+    def test_gold_labels_for_spans(self, tag_format):
+        sentence = Sentence("George Washington went to New York City with Bob and Alice from Los Angeles")
+        sentence[0:2].add_label(self.train_label_type, "PER")
+        sentence[4:7].add_label(self.train_label_type, "LOC")
+        sentence[8:9].add_label(self.train_label_type, "PER")
+        sentence[10:11].add_label(self.train_label_type, "MISC")  # not in the tag dictionary
+        sentence[12:14].add_label(self.train_label_type, "LOC")
+
+        tag_dictionary = Dictionary(add_unk=True)
+        tag_dictionary.add_item("PER")
+        tag_dictionary.add_item("LOC")
+        tag_dictionary.span_labels = True
+
+        vocab = Dictionary()
+        for token in sentence:
+            vocab.add_item(token.text)
+
+        model = self.build_model(
+            OneHotEmbeddings(vocab, embedding_length=8),
+            tag_dictionary,
+            tag_format=tag_format,
+            allow_unk_predictions=True,
+        )
+
+        if tag_format == "BIOES":
+            expected_tags = ["B-PER", "E-PER", "O", "O", "B-LOC", "I-LOC", "E-LOC", "O", "S-PER", "O"]
+            expected_tags += ["S-MISC", "O", "B-LOC", "E-LOC"]
+        else:
+            expected_tags = ["B-PER", "I-PER", "O", "O", "B-LOC", "I-LOC", "I-LOC", "O", "B-PER", "O"]
+            expected_tags += ["B-MISC", "O", "B-LOC", "I-LOC"]
+        expected = [model.label_dictionary.get_idx_for_item(tag) for tag in expected_tags]
+
+        gold_labels = model._get_gold_labels([sentence])
+        assert gold_labels == expected
+        # the tag of the unknown label falls back to <unk>
+        unk_idx = model.label_dictionary.get_idx_for_item("<unk>")
+        assert gold_labels[10] == unk_idx
+        assert all(idx != unk_idx for position, idx in enumerate(gold_labels) if position != 10)
+
+    def test_padding_buffer_is_reused_and_not_pickled(self):
+        short = Sentence("Berlin is nice")
+        short[0:1].add_label(self.train_label_type, "LOC")
+        longer = Sentence("I love Berlin and New York City")
+        longer[2:3].add_label(self.train_label_type, "LOC")
+        longer[4:7].add_label(self.train_label_type, "LOC")
+
+        tag_dictionary = Dictionary(add_unk=False)
+        tag_dictionary.add_item("LOC")
+        tag_dictionary.span_labels = True
+
+        vocab = Dictionary()
+        for token in list(short) + list(longer):
+            vocab.add_item(token.text)
+
+        model = self.build_model(OneHotEmbeddings(vocab, embedding_length=8), tag_dictionary)
+        embedding_length = model.embeddings.embedding_length
+
+        # the buffer is created on the first batch and reused as long as no longer sentence shows up
+        model.forward_loss([short])
+        buffer = model._padding_zeros
+        assert buffer.size(0) == embedding_length * len(short)
+        model.forward_loss([short, short])
+        assert model._padding_zeros is buffer
+
+        # a longer batch grows the buffer
+        model.forward_loss([longer, short])
+        assert model._padding_zeros is not buffer
+        assert model._padding_zeros.size(0) == embedding_length * len(longer)
+
+        # the buffer is a cache, so it is not pickled along with the model
+        loaded_model = pickle.loads(pickle.dumps(model))
+        assert "_padding_zeros" not in loaded_model.__dict__
+        assert model._padding_zeros is not None
+
+        loss, count = loaded_model.forward_loss([longer, short])
+        assert count == len(longer) + len(short)
+        loaded_model.predict([longer, short], label_name="predicted")
+        assert loaded_model._padding_zeros.size(0) == embedding_length * len(longer)
@@ -0,0 +1,62 @@
+import pytest
+
+from flair.data import Dictionary, Sentence, TextPair
+from flair.embeddings import DocumentPoolEmbeddings, OneHotEmbeddings
+from flair.models import TextPairClassifier
+from tests.model_test_utils import BaseModelTest
+
+
+class TestTextPairClassifier(BaseModelTest):
+    model_cls = TextPairClassifier
+    train_label_type = "entailment"
+
+    @pytest.fixture
+    def text_pairs(self):
+        pairs = [
+            TextPair(Sentence("I love Berlin"), Sentence("Berlin is nice")),
+            TextPair(Sentence("the cat sleeps"), Sentence("a dog barks loudly")),
+            TextPair(Sentence("Berlin"), Sentence("the dog is nice")),
+        ]
+        for pair, value in zip(pairs, ["yes", "no", "no"]):
+            pair.add_label(self.train_label_type, value)
+        yield pairs
+
+    @pytest.fixture
+    def embeddings(self, text_pairs):
+        vocab = Dictionary()
+        for pair in text_pairs:
+            for token in list(pair.first) + list(pair.second):
+                vocab.add_item(token.text)
+        yield DocumentPoolEmbeddings([OneHotEmbeddings(vocab, embedding_length=8)])
+
+    @pytest.fixture
+    def label_dict(self):
+        label_dict = Dictionary(add_unk=False)
+        label_dict.add_item("yes")
+        label_dict.add_item("no")
+        yield label_dict
+
+    @pytest.mark.parametrize("embed_separately", [True, False])
+    def test_embed_forward_loss_predict(self, embeddings, label_dict, text_pairs, embed_separately):
+        model = self.build_model(embeddings, label_dict, embed_separately=embed_separately)
+
+        embedded = model._get_embeddings_for_data_points(text_pairs)
+        assert embedded.shape == (len(text_pairs), model.final_embedding_size)
+        assert model.final_embedding_size == (16 if embed_separately else 8)
+
+        for pair in text_pairs:
+            pair.clear_embeddings()
+
+        loss, count = model.forward_loss(text_pairs)
+        assert count == len(text_pairs)
+        assert loss.requires_grad
+
+        # predict into a separate label type (as evaluate() does), so the gold labels are kept for the loss
+        loss, count = model.predict(text_pairs, label_name="predicted", return_loss=True)
+        assert count == len(text_pairs)
+        for pair in text_pairs:
+            assert pair.get_labels(self.train_label_type)
+            predicted = pair.get_labels("predicted")
+            assert len(predicted) == 1
+            assert predicted[0].value in ["yes", "no"]
+            assert 0.0 <= predicted[0].score <= 1.0
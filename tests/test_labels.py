@@ -1,6 +1,6 @@
 from typing import List
 
-from flair.data import Label, Relation, Sentence, Span
+from flair.data import Label, Relation, Sentence, Span, get_spans_from_bio
 
 
 def test_token_tags():
@@ -276,3 +276,21 @@ def test_data_point_equality():
     assert span_ner_label.data_point == span_other_label.data_point
     assert ner_label.data_point != span_other_label.data_point
     assert other_label.data_point != span_ner_label.data_point
+
+
+def test_spans_from_bio():
+    # BIOES and IOB tags are decoded into spans with averaged scores
+    tags = ["B-PER", "I-PER", "O", "S-LOC", "I-ORG", "E-ORG", "B-LOC", "I-PER"]
+    scores = [0.5, 1.0, 0.9, 0.8, 0.6, 0.4, 1.0, 0.5]
+    spans = get_spans_from_bio(tags, scores)
+    assert spans == [
+        ([0, 1], 0.75, "PER"),
+        ([3], 0.8, "LOC"),
+        ([4, 5], 0.5, "ORG"),
+        ([6], 1.0, "LOC"),
+        ([7], 0.5, "PER"),
+    ]
+
+    # empty and "_" tags are OUT tags and scores default to 1.0
+    spans = get_spans_from_bio(["B-PER", "", "_", "I-PER"])
+    assert spans == [([0], 1.0, "PER"), ([3], 1.0, "PER")]
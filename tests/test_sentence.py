@@ -1,3 +1,5 @@
+import torch
+
 from flair.data import Sentence
 
 
@@ -73,3 +75,16 @@ def test_start_end_position_pretokenized() -> None:
         (10, 18),
         (19, 20),
     ]
+
+
+def test_token_get_each_embedding():
+    token = Sentence("Berlin")[0]
+    token.set_embedding("b", torch.tensor([2.0]))
+    token.set_embedding("a", torch.tensor([1.0]))
+    token.set_embedding("c", torch.tensor([3.0]))
+
+    expected = [[1.0], [2.0]]
+    assert [emb.tolist() for emb in token.get_each_embedding(["b", "a"])] == expected
+    # pre-sorted names give the same result, names without an embedding are skipped
+    assert [emb.tolist() for emb in token.get_each_embedding(["a", "b", "d"], names_are_sorted=True)] == expected
+    assert len(token.get_each_embedding()) == 3